@@ -18,31 +18,13 @@ __author__ = "Orsiris de Jong"
 __copyright__ = "Copyright (C) 2019-2024 Orsiris de Jong"
 __description__ = "CSV file reader with header management, fieldnames, delimiters and comment skipping"
 __licence__ = "BSD 3 Clause"
-__version__ = "1.0.2"
-__build__ = "2024090701"
-__compat__ = "python2.7+"
+__version__ = "1.1.0"
+__build__ = "2026101501"
+__compat__ = "python3.6+"
 
 
-import sys
 import csv
-
-# python 2.7 compat fixes
-try:
-    from typing import Iterable
-except ImportError:
-    pass
-
-if sys.version_info[0] < 3:
-    from io import open as open
-
-
-# Use OrderedDict for Python < 3.6 since csv.DictReader won't have ordered output
-if sys.version_info[0] < 3 or (sys.version_info[0] == 3 and sys.version_info[1] < 6):
-    from collections import OrderedDict
-
-    use_OrderedDict = True
-else:
-    use_OrderedDict = False
+from typing import Iterable
 
 
 def csv_dict_reader(file, skip_comment_char=None, encoding="utf-8", **kwargs):
@@ -50,14 +32,11 @@ def csv_dict_reader(file, skip_comment_char=None, encoding="utf-8", **kwargs):
     """
     Reads CSV file and provides a generator for every line and skips commented out lines
 
-    ATTENTION, this gave me headaches:
-    Python < 3.6 returns unordered dicts, so it looks like results are random, but only the dict order is
-    Python == 3.7 returns OrderedDict instead of dict
-    Python >= 3.8 returns dict with ordered results
-
+    Returned dicts keep column order since Python 3.6 dicts are ordered
 
     :param file: (str) path to csv file to read
-    :param skip_comment_char: (str) optional character which, if found on first row, will skip row
+    :param skip_comment_char: (str) optional character which, if found at the beginning of a row, will skip row
+                                    Commented rows before header are skipped too
     :param delimiter: (char) CSV delimiter char
     :param fieldnames: (list) CSV field names for dictionary creation, implies that no header is present in file
                               If not given, first line is used as header and skipped from results
@@ -69,20 +48,40 @@ def csv_dict_reader(file, skip_comment_char=None, encoding="utf-8", **kwargs):
     delimiter = kwargs.pop("delimiter", ",")
     fieldnames = kwargs.pop("fieldnames", None)
 
-    with open(file, encoding=encoding) as fp:
-        csv_data = csv.DictReader(fp, delimiter=delimiter, fieldnames=fieldnames)
+    # We don't use csv.DictReader here since it does way too much per row work
+    # Let's build our dicts from plain csv.reader rows and a precomputed header instead
+    with open(file, encoding=encoding, newline="", buffering=1 << 20) as fp:
+        csv_data = csv.reader(fp, delimiter=delimiter)
+
+        if fieldnames is None:
+            # Comments are checked on parsed rows rather than raw lines, so quoted multiline values
+            # containing lines beginning with skip_comment_char are kept
+            for fieldnames in csv_data:
+                if fieldnames and not (
+                    skip_comment_char and fieldnames[0].startswith(skip_comment_char)
+                ):
+                    break
+            else:
+                return
+        header = tuple(fieldnames)
+        header_len = len(header)
 
         for row in csv_data:
-            if use_OrderedDict:
-                # pylint: disable=E0606 (possibly-used-before-assignment)
-                row = OrderedDict(
-                    sorted(
-                        row.items(), key=lambda item: csv_data.fieldnames.index(item[0])
-                    )
-                )
-            row_name = list(row)[0]
-            if skip_comment_char:
-                if row[row_name].startswith(skip_comment_char):
-                    continue
-            yield row
-            continue
+            # Skip empty lines like csv.DictReader does
+            if not row:
+                continue
+            if skip_comment_char and row[0].startswith(skip_comment_char):
+                continue
+            row_len = len(row)
+            if row_len == header_len:
+                yield dict(zip(header, row))
+                continue
+            # Keep csv.DictReader behavior for malformed rows: missing values are None,
+            # additional values are stored as list under the None key
+            data = dict(zip(header, row))
+            if row_len > header_len:
+                data[None] = row[header_len:]
+            else:
+                for key in header[row_len:]:
+                    data[key] = None
+            yield data
@@ -18,74 +18,204 @@ __author__ = "Orsiris de Jong"
 __copyright__ = "Copyright (C) 2017-2024 Orsiris de Jong"
 __description__ = "File/dir/permissions/time handling"
 __licence__ = "BSD 3 Clause"
-__version__ = "1.2.4"
-__build__ = "2022110601"
-__compat__ = "python2.7+"
-
+__version__ = "1.3.0"
+__build__ = "2026101501"
+__compat__ = "python3.6+"
+
+__all__ = [
+    "ACCESS_CHECK_CACHE_TTL",
+    "PARALLEL_REMOVE_MIN_FILES",
+    "check_file_timestamp_delta",
+    "check_path_access",
+    "file_creation_date",
+    "file_modification_date",
+    "get_file_time",
+    "get_file_times",
+    "get_files_recursive",
+    "get_paths_recursive",
+    "get_timestamp",
+    "get_timestamp_threshold",
+    "get_writable_random_file",
+    "get_writable_temp_dir",
+    "glob_path_match",
+    "grep",
+    "hide_file",
+    "hide_unix_file",
+    "hide_windows_file",
+    "igrep",
+    "is_file_older_than",
+    "log_perm_error",
+    "make_path",
+    "move_file",
+    "read_json_from_file",
+    "remove_bom",
+    "remove_dir",
+    "remove_file",
+    "remove_files_older_than",
+    "remove_files_on_timestamp_delta",
+    "replace_in_file",
+    "write_json_to_file",
+]
+
+import errno
 import json
 import logging
+import mmap
 import os
-import sys
 import re
 import shutil
+import tempfile
+import time
+import weakref
 from ofunctions import random
 from contextlib import contextmanager
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from datetime import datetime
-from fnmatch import fnmatch
-from itertools import chain
+from fnmatch import translate
+from functools import lru_cache
+from stat import S_ISREG, S_IWRITE
 from threading import Lock
+from typing import Callable, Iterable, Iterator, List, Union, Optional
 
-# Python 2.7 compat fixes
-try:
-    from typing import Callable, Iterable, Union, Optional
-except ImportError:
-    pass
-if sys.version_info[0] < 3:
-
-    class FileNotFoundError(OSError):
-        pass
 
-    class PermissionError(OSError):
-        pass
+def get_timestamp(date):
+    return date.timestamp()
 
 
-# Python 2.7 compat where datetime.now() does not have .timestamp() method
-if sys.version_info[0] < 3 or sys.version_info[1] < 4:
-    # python version < 3.3
-    import time
+if os.name == "nt":
+    import ctypes
+    from ctypes import wintypes
 
-    def get_timestamp(date):
-        return time.mktime(date.timetuple())
+    _KERNEL32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _GetFileAttributesW = _KERNEL32.GetFileAttributesW
+    _GetFileAttributesW.argtypes = [wintypes.LPCWSTR]
+    _GetFileAttributesW.restype = wintypes.DWORD
+    _SetFileAttributesW = _KERNEL32.SetFileAttributesW
+    _SetFileAttributesW.argtypes = [wintypes.LPCWSTR, wintypes.DWORD]
+    _SetFileAttributesW.restype = wintypes.BOOL
 
-else:
+_FILE_ATTRIBUTE_HIDDEN = 0x2
+_INVALID_FILE_ATTRIBUTES = 0xFFFFFFFF
 
-    def get_timestamp(date):
-        return date.timestamp()
-
-
-from command_runner import command_runner
+# orjson is an optional faster json encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__intname__)
-FILE_LOCK = None
+# Per path locks, entries vanish once no thread holds a reference to the lock anymore
+_PATH_LOCKS = weakref.WeakValueDictionary()
+_PATH_LOCKS_GUARD = Lock()
 
 
 @contextmanager
-def _file_lock():
+def _file_lock(
+    *paths,  # type: str
+):
     """
-    Simple file lock to make no concurrent file operations happen in threaded / mp workflows
+    Simple per path file lock to make no concurrent operations happen on the same files in threaded workflows
+    Operations on unrelated paths don't block each other
     Use as:
-    with _file_lock()
+    with _file_lock(path)
         your_file_code
     """
-    # pylint: disable=global-statement
-    global FILE_LOCK
+    # Always acquire locks in the same order so we can't deadlock when multiple paths are given
+    keys = sorted(set(os.path.normcase(os.path.abspath(path)) for path in paths))
+    locks = []
+    with _PATH_LOCKS_GUARD:
+        for key in keys:
+            lock = _PATH_LOCKS.get(key)
+            if lock is None:
+                lock = Lock()
+                _PATH_LOCKS[key] = lock
+            locks.append(lock)
+    acquired = []
+    try:
+        for lock in locks:
+            lock.acquire()
+            acquired.append(lock)
+        yield
+    finally:
+        for lock in reversed(acquired):
+            lock.release()
+
+
+# Access check results are cached for this amount of seconds, since permissions may change
+ACCESS_CHECK_CACHE_TTL = 5
 
-    if FILE_LOCK is None:
-        FILE_LOCK = Lock()
-    FILE_LOCK.acquire()
-    yield
-    if FILE_LOCK is not None:
-        FILE_LOCK.release()
+
+@lru_cache(maxsize=2048)
+def _check_path_access(
+    sub_path,  # type: str
+    check,  # type: str
+    ttl_bucket,  # type: int
+):
+    # type: (...) -> bool
+    """
+    Checks access to a single path, results are cached by (path, check, ttl_bucket)
+    ttl_bucket only exists so cache entries naturally expire every ACCESS_CHECK_CACHE_TTL seconds
+    """
+    perm_type = "writable" if check == "W" else "readable"
+    if os.path.exists(sub_path):
+        obj = "file" if os.path.isfile(sub_path) else "directory"
+        if os.name != "nt":
+            # access(2) honors POSIX permissions and ACLs, which saves opening / creating probe files
+            res = os.access(
+                sub_path,
+                os.W_OK if check == "W" else os.R_OK,
+                effective_ids=os.access in os.supports_effective_ids,
+            )
+        elif obj == "file":
+            if check == "W":
+                try:
+                    fp = open(sub_path, "a")
+                    fp.close()
+                    res = True
+                except (PermissionError, OSError):
+                    res = False
+            else:
+                try:
+                    fp = open(sub_path, "r")
+                    fp.close()
+                    res = True
+                except (PermissionError, OSError):
+                    res = False
+        # Handle directory tests
+        else:
+            if check == "W":
+                try:
+                    # Let's create a real file in path in order to check effective write permissions
+                    # tempfile creates it with O_EXCL and removes it on close
+                    tempfile.NamedTemporaryFile(
+                        dir=sub_path, prefix=".ofaccess_", delete=True
+                    ).close()
+                    res = True
+                except (IOError, OSError):
+                    res = False
+            else:
+                try:
+                    os.listdir(sub_path)
+                    res = True
+                except (PermissionError, OSError):
+                    res = False
+
+        if res:
+            logger.debug('Path "{0}" is a {1} {2}.'.format(sub_path, perm_type, obj))
+        else:
+            logger.warning(
+                'Path "{0}" is a non {1} {2}.'.format(sub_path, perm_type, obj)
+            )
+        return res
+
+    else:
+        logger.warning(
+            'Path "{0}" does not exist or has ACLs that prevent access.'.format(
+                sub_path
+            )
+        )
+    return False
 
 
 def check_path_access(
@@ -98,91 +228,31 @@ def check_path_access(
     when writable checks fail, we automatically fallback to readable tests
     This is mostly a debug function, we only log successes in debug level
 
-    We don't rely on os.access since it doesn't work well on Windows:
+    We don't rely on os.access on Windows since it doesn't work well there:
             os.access also returns True with writable files or links
             os.access does report W_OK with windows directories when they aren't supposed to
 
+    Results are cached for ACCESS_CHECK_CACHE_TTL seconds, use check_path_access.cache_clear() to invalidate them
+    after permission changes
+
     :param path: path to check (directory or file)
     :param check: [R/W] check for readability / writability
     :return: bool: do we have desired access ?
     """
-    if check == "W":
-        perm_type = "writable"
-    else:
-        perm_type = "readable"
-
     logger.debug('Checking access to path "{0}"'.format(path))
 
-    def _check_path_access(
-        sub_path,  # type: str
-    ):
-        # type: (...) -> bool
-        if os.path.exists(sub_path):
-            obj = "file" if os.path.isfile(sub_path) else "directory"
-            if obj == "file":
-                if check == "W":
-                    try:
-                        fp = open(sub_path, "a")
-                        fp.close()
-                        res = True
-                    except (PermissionError, OSError):
-                        res = False
-                else:
-                    try:
-                        fp = open(sub_path, "r")
-                        fp.close()
-                        res = True
-                    except (PermissionError, OSError):
-                        res = False
-            # Handle directory tests
-            else:
-                if check == "W":
-                    try:
-                        # Let's create a real file in path in order to check effective write permissions
-                        test_file = (
-                            sub_path
-                            + "/.somehopefullyunexistenttestfile"
-                            + str(get_timestamp(datetime.now()))
-                        )
-                        open(test_file, "w")
-                        remove_file(test_file)
-                        res = True
-                    except (IOError, OSError):
-                        res = False
-                else:
-                    try:
-                        os.listdir(sub_path)
-                        res = True
-                    except (PermissionError, OSError):
-                        res = False
-
-            if res:
-                logger.debug(
-                    'Path "{0}" is a {1} {2}.'.format(sub_path, perm_type, obj)
-                )
-            else:
-                logger.warning(
-                    'Path "{0}" is a non {1} {2}.'.format(sub_path, perm_type, obj)
-                )
-            return res
-
-        else:
-            logger.warning(
-                'Path "{0}" does not exist or has ACLs that prevent access.'.format(
-                    sub_path
-                )
-            )
-        return False
+    ttl_bucket = int(time.monotonic() // ACCESS_CHECK_CACHE_TTL)
 
     def _split_path(
         path,  # type: str
+        check,  # type: str
     ):
         # type: (...) -> bool
         split_path = (path, "")
         can_split = True
         failed_once = False
         while can_split is True:
-            if _check_path_access(split_path[0]):
+            if _check_path_access(split_path[0], check, ttl_bucket):
                 break
             else:
                 failed_once = True
@@ -191,35 +261,48 @@ def check_path_access(
                 can_split = False
         return failed_once
 
-    result = _split_path(path)
+    result = _split_path(path, check)
     if result and check == "W":
         # If not writable, fallback to a readable test
-        perm_type = "readable"
-        check = "R"
-        _split_path(path)
+        _split_path(path, "R")
 
     if result:
         logger.warning('Path "{0}" {1} check failed.'.format(path, check))
     return not result
 
 
+check_path_access.cache_clear = _check_path_access.cache_clear
+
+
 def make_path(
     path,  # type: str
 ):
     # type: (...) -> None
-    with _file_lock():
-        # May be false even if dir exists but ACLs deny
-        if not os.path.isdir(path):
-            os.makedirs(path)
+    # No lock needed here, exist_ok makes concurrent directory creation safe
+    os.makedirs(path, exist_ok=True)
 
 
 def remove_file(
     path,  # type: str
 ):
     # type: (...) -> None
-    with _file_lock():
-        # May be false even if dir exists but ACLs deny
-        if os.path.isfile(path):
+    """
+    Removes a file, missing paths and directories are ignored
+    """
+    with _file_lock(path):
+        # No existence check beforehand, os.remove() errors already tell us everything in one syscall
+        try:
+            os.remove(path)
+        except (FileNotFoundError, IsADirectoryError):
+            pass
+        except PermissionError:
+            # Windows and macOS report directories as permission errors
+            if os.path.isdir(path):
+                return
+            if os.name != "nt":
+                raise
+            # Windows refuses to remove read-only files, let's clear read-only attribute and retry once
+            os.chmod(path, S_IWRITE)
             os.remove(path)
 
 
@@ -227,7 +310,7 @@ def remove_dir(
     path,  # type: str
 ):
     # type: (...) -> None
-    with _file_lock():
+    with _file_lock(path):
         # May be false even if dir exists but ACLs deny
 
         # We need to use shutil.rmtree() instead of os.remove() since the latter implementation
@@ -243,12 +326,79 @@ def move_file(
 ):
     # type: (...) -> None
     make_path(os.path.dirname(dest))
-    with _file_lock():
+    with _file_lock(source, dest):
         # Using copy function because we don't want metadata, permissions, buffer nor anything else
-        if sys.version_info[0] >= 3:
-            shutil.move(source, dest, copy_function=shutil.copy)
+        shutil.move(source, dest, copy_function=shutil.copy)
+
+
+# Characters that make a glob pattern something else than a literal path
+_GLOB_MAGIC_CHARS = re.compile("[*?[]")
+
+
+@lru_cache(maxsize=256)
+def _compile_glob_patterns(
+    pattern_list,  # type: tuple
+):
+    # type: (...) -> tuple
+    """
+    Splits glob style wildcard patterns by the cheapest way to match them:
+    - literal patterns can only match equal paths, so a hash lookup is enough
+    - "prefix*" and "*suffix" patterns are matched with a single str.startswith() / str.endswith() call
+    - every other pattern goes into one single regex alternation
+    Patterns are normalized like fnmatch() does, hence matches are case insensitive on Windows
+    Returns a (frozenset, tuple, tuple, Optional[re.Pattern]) tuple of literals, prefixes, suffixes and regex
+    """
+    literals = set()
+    prefixes = []
+    suffixes = []
+    wildcards = []
+    for pattern in pattern_list:
+        pattern = os.path.normcase(pattern)
+        if _GLOB_MAGIC_CHARS.search(pattern) is None:
+            literals.add(pattern)
+        elif pattern.startswith("*") and _GLOB_MAGIC_CHARS.search(pattern, 1) is None:
+            suffixes.append(pattern[1:])
+        elif pattern.endswith("*") and _GLOB_MAGIC_CHARS.search(pattern[:-1]) is None:
+            prefixes.append(pattern[:-1])
         else:
-            shutil.move(source, dest)
+            wildcards.append(translate(pattern))
+    return (
+        frozenset(literals),
+        tuple(prefixes),
+        tuple(suffixes),
+        re.compile("|".join(wildcards)) if wildcards else None,
+    )
+
+
+def _get_glob_matcher(
+    pattern_list,  # type: Optional[list]
+):
+    # type: (...) -> Optional[Callable]
+    """
+    Returns a function checking if a path matches any of given glob style wildcard patterns
+    Returns None when there is no pattern to match, so callers can skip matching altogether
+    """
+    if not pattern_list:
+        return None
+    literals, prefixes, suffixes, regex = _compile_glob_patterns(tuple(pattern_list))
+    checks = []
+    if literals:
+        checks.append(literals.__contains__)
+    if prefixes:
+        checks.append(lambda path: path.startswith(prefixes))
+    if suffixes:
+        checks.append(lambda path: path.endswith(suffixes))
+    if regex is not None:
+        checks.append(lambda path: regex.match(path) is not None)
+    if len(checks) == 1:
+        match = checks[0]
+    else:
+        match = lambda path: any(check(path) for check in checks)
+    if os.name == "nt":
+        # os.path.normcase() is a no-op on other platforms
+        normcase = os.path.normcase
+        return lambda path: match(normcase(path))
+    return match
 
 
 def glob_path_match(
@@ -262,7 +412,8 @@ def glob_path_match(
     :param pattern_list: list of wildcard patterns to check for
     :return: Boolean
     """
-    return any(fnmatch(path, pattern) for pattern in pattern_list)
+    match = _get_glob_matcher(pattern_list)
+    return match is not None and match(path)
 
 
 def log_perm_error(
@@ -277,6 +428,217 @@ def log_perm_error(
     check_path_access(path, "W")
 
 
+def _make_dir_scanner(
+    root,  # type: str
+    min_depth,  # type: int
+    max_depth,  # type: int
+    exclude_files,  # type: bool
+    d_exclude_match,  # type: Optional[Callable]
+    d_include_match,  # type: Optional[Callable]
+    f_exclude_match,  # type: Optional[Callable]
+    f_include_match,  # type: Optional[Callable]
+    ext_exclude_list,  # type: Optional[frozenset]
+    ext_include_list,  # type: Optional[frozenset]
+    fn_on_perm_error,  # type: Optional[Callable]
+    yield_entries,  # type: bool
+    follow_symlinks,  # type: bool
+):
+    # type: (...) -> Callable
+    """
+    Returns a function that lists a single directory with already compiled filters
+    The returned function takes (path, depth, root relative path), root being depth 1
+    and returns a (files, sub_dirs) tuple, sub_dirs being items of the same form as its arguments
+    os.scandir() DirEntry objects give us file types without additional stat calls on most platforms
+    """
+    # Bind hot loop functions to local names to avoid global / attribute lookups per entry
+    join = os.path.join
+    splitext = os.path.splitext
+    scandir = os.scandir
+    # str.endswith() takes a tuple and rules out most files with a single C level call
+    # os.path.splitext() then only confirms candidates, so extension semantics stay the same
+    ext_exclude_suffixes = tuple(ext_exclude_list) if ext_exclude_list else None
+    ext_include_suffixes = tuple(ext_include_list) if ext_include_list else None
+
+    # Symlinked directories are only walked once, identified by (st_dev, st_ino), so symlink loops end
+    # Only symlinks can create loops, hence plain directories don't need any additional stat call
+    visited = set()
+    visited_lock = Lock()
+
+    def mark_visited(
+        path,  # type: str
+    ):
+        # type: (...) -> bool
+        try:
+            # DirEntry.stat() gives zeroed inodes on Windows, so we need os.stat()
+            stat_result = os.stat(path)
+        except OSError:
+            return False
+        key = (stat_result.st_dev, stat_result.st_ino)
+        # Scans may run in multiple threads
+        with visited_lock:
+            if key in visited:
+                return False
+            visited.add(key)
+        return True
+
+    if follow_symlinks:
+        mark_visited(root)
+
+    def list_dir(
+        path,  # type: str
+        depth,  # type: int
+        rel_prefix,  # type: str
+        can_descend,  # type: bool
+        yield_files,  # type: bool
+    ):
+        # type: (...) -> tuple
+        files = []
+        sub_dirs = []
+        with scandir(path) as entries:
+            for entry in entries:
+                # Keep os.path.isdir() behavior where errors just mean "not a directory"
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if not can_descend:
+                        continue
+                    if entry.is_symlink() and (
+                        not follow_symlinks or not mark_visited(entry.path)
+                    ):
+                        continue
+                    # p_root is the root relative path of the directory
+                    # Let's check if p_root is in d_exclude_list
+                    p_root = rel_prefix + entry.name
+                    if (d_exclude_match is None or not d_exclude_match(p_root)) and (
+                        d_include_match is None or d_include_match(p_root)
+                    ):
+                        sub_dirs.append((entry.path, depth + 1, p_root))
+                    continue
+                if not yield_files:
+                    continue
+                # Apply name based filters first, since is_file() may need a stat call
+                # for symlinks or on filesystems that don't report file types
+                file = entry.name
+                if not (
+                    (f_exclude_match is None or not f_exclude_match(file))
+                    and (
+                        ext_exclude_suffixes is None
+                        or not file.endswith(ext_exclude_suffixes)
+                        or splitext(file)[1] not in ext_exclude_list
+                    )
+                    and (f_include_match is None or f_include_match(file))
+                    and (
+                        ext_include_suffixes is None
+                        or (
+                            file.endswith(ext_include_suffixes)
+                            and splitext(file)[1] in ext_include_list
+                        )
+                    )
+                ):
+                    continue
+                try:
+                    is_file = entry.is_file()
+                except OSError:
+                    is_file = False
+                if is_file:
+                    files.append(entry if yield_entries else entry.path)
+        return files, sub_dirs
+
+    def scan(
+        path,  # type: str
+        depth,  # type: int
+        rel_path,  # type: Optional[str]
+    ):
+        # type: (...) -> tuple
+        can_descend = max_depth == 0 or depth < max_depth
+        yield_files = depth >= min_depth and not exclude_files
+        if not can_descend and not yield_files:
+            return [], []
+        # Compute the root relative prefix once per directory instead of calling os.path.join() per entry
+        # os.scandir() already builds entry.path the same way
+        rel_prefix = join(rel_path, "") if rel_path is not None else ""
+
+        try:
+            return list_dir(path, depth, rel_prefix, can_descend, yield_files)
+        except PermissionError:
+            # Check if we are allowed to read directory, if not, try to fix permissions if fn_on_perm_error is passed
+            if fn_on_perm_error is None:
+                log_perm_error(path)
+                return [], []
+            fn_on_perm_error(path)
+        # fn_on_perm_error may have fixed permissions, so let's list the directory once more
+        try:
+            return list_dir(path, depth, rel_prefix, can_descend, yield_files)
+        except PermissionError:
+            return [], []
+
+    return scan
+
+
+def _walk_paths(
+    root,  # type: str
+    primary_root,  # type: Optional[str]
+    min_depth,  # type: int
+    exclude_dirs,  # type: bool
+    scan,  # type: Callable
+):
+    # type: (...) -> Iterable
+    """
+    Serial path walker behind get_paths_recursive()
+    Walks the tree using an explicit stack instead of recursion, results keep directory listing order
+    """
+    stack = deque([(root, 1, primary_root)])
+    while stack:
+        path, depth, rel_path = stack.pop()
+        if depth >= min_depth and not exclude_dirs:
+            yield path
+        files, sub_dirs = scan(path, depth, rel_path)
+        for file in files:
+            yield file
+        # Reverse subdirectories so they get popped in directory listing order
+        stack.extend(reversed(sub_dirs))
+
+
+def _walk_paths_parallel(
+    root,  # type: str
+    primary_root,  # type: Optional[str]
+    min_depth,  # type: int
+    exclude_dirs,  # type: bool
+    scan,  # type: Callable
+    workers,  # type: int
+):
+    # type: (...) -> Iterable
+    """
+    Threaded path walker behind get_paths_recursive()
+    Directory listings are I/O bound and os.scandir() releases the GIL, so every directory
+    is scanned in a thread pool while the calling thread yields results as scans complete
+    Result order is not deterministic
+    """
+    if min_depth <= 1 and not exclude_dirs:
+        yield root
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pending = {executor.submit(scan, root, 1, primary_root)}
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, sub_dirs = future.result()
+                for sub_dir in sub_dirs:
+                    pending.add(executor.submit(scan, *sub_dir))
+                for sub_dir, depth, _ in sub_dirs:
+                    if depth >= min_depth and not exclude_dirs:
+                        yield sub_dir
+                for file in files:
+                    yield file
+    finally:
+        # Don't keep scanning when the caller stops iterating early
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
 def get_paths_recursive(
     root,  # type: str
     d_exclude_list=None,  # type: list
@@ -291,8 +653,11 @@ def get_paths_recursive(
     max_depth=0,  # type: int
     primary_root=None,  # type: str
     fn_on_perm_error=None,  # type: Callable
+    workers=1,  # type: int
+    yield_entries=False,  # type: bool
+    follow_symlinks=True,  # type: bool
 ):
-    # type: (...) -> Union[Iterable, str]
+    # type: (...) -> Iterator[str]
     """
     Walk a path to recursively find files
     Accepts glob style windcards for every list parameter except file extension lists
@@ -317,16 +682,23 @@ def get_paths_recursive(
                            (f_include_list is processed after exclusion processing)
     :param exclude_dirs: (bool) Exclude directories from results
     :param exclude_files: (bool) Exclude files from results
-    :param ext_exclude_list: list() list of file extensions to exclude, ex: ['.log', '.bak']
-    :param ext_include_list: (list) list of file extensions to include, ex: ['.py']
+    :param ext_exclude_list: list() list of file extensions to exclude, ex: ['.log', '.bak'] or '.log'
+    :param ext_include_list: (list) list of file extensions to include, ex: ['.py'] or '.py'
                              (ext_include_list is processed after exclusion processing)
     :param min_depth: (int) minimal depth of results to show, defaults to 1 being the root and it's files
     :param max_depth: (int) depth of recursion, 0 means unlimited, 1 is the root, 2 would be one subdirectory
-    :param primary_root: (str) Only used for internal recursive exclusion lookup, don't pass an argument here
+    :param primary_root: (str) Optional root relative path prefix used for d_exclude_list / d_include_list lookups
     :param fn_on_perm_error: (function) Optional function to pass, which argument will be the file / directory that
            has permission errors so it can be handled
            If not given, permission errors are logged
-    :return: chained iterator of files found in path
+           When workers > 1, it is called from worker threads
+    :param workers: (int) Number of threads scanning directories concurrently, useful on network / slow filesystems
+                    Results order is not deterministic when workers > 1
+    :param yield_entries: (bool) Yield files as os.DirEntry objects instead of paths, so their cached stat() results
+                          can be reused, ie with check_file_timestamp_delta(). Directories are still yielded as paths
+    :param follow_symlinks: (bool) Walk symlinked directories, every symlinked directory is walked only once so
+                            symlink loops can't make walks endless. When False, symlinked directories are skipped
+    :return: iterator of paths found in root
     """
 
     # Make sure we don't get paths with antislashes on Windows
@@ -335,105 +707,39 @@ def get_paths_recursive(
     else:
         raise FileNotFoundError("{} is not a directory.".format(root))
 
-    # Check if we are allowed to read directory, if not, try to fix permissions if fn_on_perm_error is passed
-    try:
-        os.listdir(root)
-    except PermissionError:
-        if fn_on_perm_error is not None:
-            fn_on_perm_error(root)
-        else:
-            log_perm_error(root)
-
-    # Make sure we clean d_exclude_list only on first function call
-    if primary_root is None:
-        if d_exclude_list is not None:
-            # Make sure we use a valid os separator for exclusion lists
-            d_exclude_list = [os.path.normpath(dir) for dir in d_exclude_list]
-        if d_include_list is not None:
-            d_include_list = [os.path.normpath(dir) for dir in d_include_list]
-
-        # Let's also make sure that min_depth parameter is used as in gnu find
-        min_depth = min_depth - 1
-
-    def _find_files(
-        min_depth,  # type: int
-    ):
-        # type: (...) -> Iterable
-        if min_depth < 1:
-            try:
-                if not exclude_dirs:
-                    yield root
-                if not exclude_files:
-                    for file in os.listdir(root):
-                        file_ext = os.path.splitext(file)[1]
-                        if (
-                            os.path.isfile(os.path.join(root, file))
-                            and (
-                                not f_exclude_list
-                                or not glob_path_match(file, f_exclude_list)
-                            )
-                            and (
-                                not ext_exclude_list or file_ext not in ext_exclude_list
-                            )
-                            and (
-                                not f_include_list
-                                or glob_path_match(file, f_include_list)
-                            )
-                            and (not ext_include_list or file_ext in ext_include_list)
-                        ):
-                            yield os.path.join(root, file)
-            except PermissionError:
-                pass
-
-    def _find_files_in_dirs(
-        min_depth,  # type: int
-        max_depth,  # type: int
-    ):
-        # type: (...) -> Iterable
-        min_depth = min_depth - 1
-        if max_depth == 0 or max_depth > 1:
-            max_depth = max_depth - 1 if max_depth > 1 else 0
-            try:
-                for dir in os.listdir(root):
-                    d_full_path = os.path.join(root, dir)
-                    if os.path.isdir(d_full_path):
-                        # p_root is the relative root the function has been called with recursively
-                        # Let's check if p_root + d is in d_exclude_list
-                        p_root = (
-                            os.path.join(primary_root, dir)
-                            if primary_root is not None
-                            else dir
-                        )
-                        if (
-                            not d_exclude_list
-                            or not glob_path_match(p_root, d_exclude_list)
-                        ) and (
-                            not d_include_list
-                            or glob_path_match(p_root, d_include_list)
-                        ):
-                            files_in_d = get_paths_recursive(
-                                d_full_path,
-                                d_exclude_list=d_exclude_list,
-                                f_exclude_list=f_exclude_list,
-                                ext_exclude_list=ext_exclude_list,
-                                ext_include_list=ext_include_list,
-                                d_include_list=d_include_list,
-                                f_include_list=f_include_list,
-                                exclude_dirs=exclude_dirs,
-                                exclude_files=exclude_files,
-                                min_depth=min_depth,
-                                max_depth=max_depth,
-                                primary_root=p_root,
-                                fn_on_perm_error=fn_on_perm_error,
-                            )
-                            for file in files_in_d:
-                                yield file
-
-            except PermissionError:
-                pass
-
-    # Chain both file and directory generators
-    return chain(_find_files(min_depth), _find_files_in_dirs(min_depth, max_depth))
+    # Normalize and compile every filter once for the whole walk
+    # Make sure we use a valid os separator for directory lists
+    if d_exclude_list:
+        d_exclude_list = [os.path.normpath(dir) for dir in d_exclude_list]
+    if d_include_list:
+        d_include_list = [os.path.normpath(dir) for dir in d_include_list]
+    # Extension lists may also be given as a single extension string, ex: ext_include_list=".txt"
+    if isinstance(ext_exclude_list, str):
+        ext_exclude_list = (ext_exclude_list,)
+    if isinstance(ext_include_list, str):
+        ext_include_list = (ext_include_list,)
+
+    scan = _make_dir_scanner(
+        root,
+        min_depth=min_depth,
+        max_depth=max_depth,
+        exclude_files=exclude_files,
+        d_exclude_match=_get_glob_matcher(d_exclude_list),
+        d_include_match=_get_glob_matcher(d_include_list),
+        f_exclude_match=_get_glob_matcher(f_exclude_list),
+        f_include_match=_get_glob_matcher(f_include_list),
+        # Extension lookups happen for every file, so let's make them O(1)
+        ext_exclude_list=frozenset(ext_exclude_list) if ext_exclude_list else None,
+        ext_include_list=frozenset(ext_include_list) if ext_include_list else None,
+        fn_on_perm_error=fn_on_perm_error,
+        yield_entries=yield_entries,
+        follow_symlinks=follow_symlinks,
+    )
+    if workers > 1:
+        return _walk_paths_parallel(
+            root, primary_root, min_depth, exclude_dirs, scan, workers
+        )
+    return _walk_paths(root, primary_root, min_depth, exclude_dirs, scan)
 
 
 def get_files_recursive(
@@ -446,8 +752,9 @@ def get_files_recursive(
     primary_root=None,  # type: str
     fn_on_perm_error=None,  # type: Callable
     include_dirs=False,  # type: bool
+    workers=1,  # type: int
 ):
-    # type: (...) -> Union[Iterable, str]
+    # type: (...) -> Iterator[str]
     """
     Wrapper for ofunctions.file_utils < 0.9.0 code
     """
@@ -463,6 +770,7 @@ def get_files_recursive(
         max_depth=depth,
         primary_root=primary_root,
         fn_on_perm_error=fn_on_perm_error,
+        workers=workers,
     )
 
 
@@ -483,28 +791,55 @@ def replace_in_file(
     :param backup_ext: optional backup extension if no dest_file is given (inplace)
     :return:
     """
-    with open(source_file, "r") as fp:
-        data = fp.read()
+    if not text_to_search:
+        raise ValueError("Cannot replace empty text")
 
     if dest_file is not None:
         file = dest_file
     elif backup_ext is not None:
         file = source_file
-        backup_file = source_file + backup_ext
-        with open(backup_file, "w") as fp:
-            fp.write(data)
+        shutil.copyfile(source_file, source_file + backup_ext)
     else:
         file = source_file
 
-    data = data.replace(text_to_search, replacement_text)
+    # Read file by chunks so we never need to load the whole file into memory
+    # We need to keep the end of every chunk which could be the beginning of a text_to_search occurrence
+    buffer = 1048576
+    keep = len(text_to_search) - 1
+    tail = ""
+    with open(source_file, "r") as file_handle_in, open(
+        file + ".tmp", "w"
+    ) as file_handle_out:
+        while True:
+            chunk = file_handle_in.read(buffer)
+            if not chunk:
+                break
+            # str.split() finds the same non overlapping occurrences str.replace() would
+            parts = (tail + chunk).split(text_to_search)
+            remainder = parts.pop()
+            if parts:
+                file_handle_out.write(replacement_text.join(parts) + replacement_text)
+            cut = max(len(remainder) - keep, 0)
+            file_handle_out.write(remainder[:cut])
+            tail = remainder[cut:]
+        file_handle_out.write(tail)
+    if os.path.isfile(file):
+        shutil.copymode(file, file + ".tmp")
+    os.replace(file + ".tmp", file)
 
-    with open(file, "w") as fp:
-        fp.write(data)
+
+# Resolve MAC time accessors once instead of on every call
+_MAC_TIME_STAT_ATTRS = {
+    "ctime": "st_ctime",
+    "mtime": "st_mtime",
+    "atime": "st_atime",
+}
 
 
 def get_file_time(
     path_to_file,  # type: str
     mac_type="ctime",  # type: str
+    stat_result=None,  # type: Optional[os.stat_result]
 ):
     # type: (...) -> float
     """
@@ -518,20 +853,30 @@ def get_file_time(
 
     Returned epochs are always UTC under Linux
     Returned epochs are TZ under Windows
+
+    stat_result may be given when path_to_file has already been stat()ed, so no additional stat call happens
     """
-    if mac_type not in ["ctime", "mtime", "atime"]:
-        raise ValueError("Invalid file MAC time type request")
     try:
-        return getattr(os.path, "get" + mac_type)(path_to_file)
-    # Some linuxes may not have os.path.getctime ?
-    except AttributeError:
-        stat = os.stat(path_to_file)
-        try:
-            return getattr(stat, "st_" + mac_type)
-        except AttributeError:
-            # We're probably on Linux. No easy way to get creation dates here,
-            # so we'll settle for when its content was last modified.
-            return stat.st_mtime
+        stat_attr = _MAC_TIME_STAT_ATTRS[mac_type]
+    except KeyError:
+        raise ValueError("Invalid file MAC time type request")
+    if stat_result is None:
+        stat_result = os.stat(path_to_file)
+    return getattr(stat_result, stat_attr)
+
+
+def get_file_times(
+    path_to_file,  # type: str
+):
+    # type: (...) -> dict
+    """
+    Returns a dict of file ctime/mtime/atime with a single stat call
+    """
+    stat_result = os.stat(path_to_file)
+    return {
+        mac_type: getattr(stat_result, stat_attr)
+        for mac_type, stat_attr in _MAC_TIME_STAT_ATTRS.items()
+    }
 
 
 def file_creation_date(
@@ -554,8 +899,36 @@ def file_modification_date(
     return get_file_time(path_to_file, "mtime")
 
 
+def get_timestamp_threshold(
+    years=0,  # type: int
+    days=0,  # type: int
+    hours=0,  # type: int
+    minutes=0,  # type: int
+    seconds=0,  # type: int
+    timestamp=None,  # type: float
+):
+    # type: (...) -> float
+    """
+    Returns the timestamp + delta epoch that file MAC times are compared to
+    If no timestamp is given, we'll use current time
+
+    When checking many files, compute the threshold once and pass it as timestamp without delta
+    to check_file_timestamp_delta(), so every check boils down to a float comparison
+    """
+    delta = (
+        seconds + (minutes * 60) + (hours * 3600) + (days * 86400) + (years * 31536000)
+    )
+
+    if not timestamp:
+        # File MAC times are epochs, which do not depend on timezone
+        now = time.time()
+    else:
+        now = timestamp
+    return now + delta
+
+
 def check_file_timestamp_delta(
-    file,  # type: str
+    file,  # type: Union[str, os.DirEntry]
     mac_type="ctime",  # type: str
     years=0,  # type: int
     days=0,  # type: int
@@ -563,6 +936,7 @@ def check_file_timestamp_delta(
     minutes=0,  # type: int
     seconds=0,  # type: int
     timestamp=None,  # type: float
+    stat_result=None,  # type: Optional[os.stat_result]
 ):
     # type: (...) -> bool
     """
@@ -574,22 +948,33 @@ def check_file_timestamp_delta(
 
     future comparisons are achieved by specifying positive values, ex: days=1 would search for files created / modified / accessed tomorrow
     past comparisons are achieved by specifying negative values, ex: days=-1 would search for files created / modified / accessed yesterday
+
+    file may also be an os.DirEntry, ie from get_paths_recursive(yield_entries=True), so its cached stat() result is used
+    stat_result may be given when file has already been stat()ed, so no additional stat call happens
     """
-    if not os.path.isfile(file):
-        raise FileNotFoundError("[%s] not found." % file)
-    delta = (
-        seconds + (minutes * 60) + (hours * 3600) + (days * 86400) + (years * 31536000)
+    try:
+        stat_attr = _MAC_TIME_STAT_ATTRS[mac_type]
+    except KeyError:
+        raise ValueError("Invalid file MAC time type request")
+    if stat_result is None:
+        try:
+            stat_result = (
+                file.stat() if isinstance(file, os.DirEntry) else os.stat(file)
+            )
+        except OSError:
+            # Keep os.path.isfile() behavior where errors just mean "not a file"
+            stat_result = None
+        if stat_result is None or not S_ISREG(stat_result.st_mode):
+            raise FileNotFoundError("[%s] not found." % os.fspath(file))
+    threshold = get_timestamp_threshold(
+        years=years,
+        days=days,
+        hours=hours,
+        minutes=minutes,
+        seconds=seconds,
+        timestamp=timestamp,
     )
-
-    if not timestamp:
-        if os.name == "nt" or sys.version_info[0] < 3:
-            # file creation date is UTC for Linux Python 3+, TZ for Windows or Linux Python 2.7
-            now = get_timestamp(datetime.now())
-        else:
-            now = get_timestamp(datetime.utcnow())
-    else:
-        now = timestamp
-    return bool((now + delta - get_file_time(file, mac_type)) > 0)
+    return bool((threshold - getattr(stat_result, stat_attr)) > 0)
 
 
 def is_file_older_than(
@@ -616,6 +1001,41 @@ def is_file_older_than(
     )
 
 
+# Below this amount of files, thread pool setup costs more than it saves
+PARALLEL_REMOVE_MIN_FILES = 64
+
+
+def _remove_files(
+    files,  # type: List[str]
+):
+    # type: (...) -> None
+    """
+    Removes a list of files, already missing files are ignored
+    unlink calls release the GIL, so big lists are removed with a bounded thread pool in order to overlap I/O
+    """
+
+    def _remove(
+        filename,  # type: str
+    ):
+        # type: (...) -> None
+        try:
+            os.remove(filename)
+        except FileNotFoundError:
+            pass
+        except (IOError, OSError):
+            raise OSError("Cannot remove file [%s]." % filename)
+
+    if len(files) < PARALLEL_REMOVE_MIN_FILES:
+        for filename in files:
+            _remove(filename)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        for future in as_completed([executor.submit(_remove, file) for file in files]):
+            # Raises first encountered error, pending removals still finish
+            future.result()
+
+
 def remove_files_on_timestamp_delta(
     directory,  # type: str
     mac_type="ctime",  # type: str
@@ -624,7 +1044,7 @@ def remove_files_on_timestamp_delta(
     hours=0,  # type: int
     minutes=0,  # type: int
     seconds=0,  # type: int
-    timestamp=None,  # type: Optional[datetime]
+    timestamp=None,  # type: Optional[float]
 ):
     # type: (...) -> None
     """
@@ -632,26 +1052,33 @@ def remove_files_on_timestamp_delta(
     If no timestamp is given, we'll use current date timestamp
     """
 
+    try:
+        stat_attr = _MAC_TIME_STAT_ATTRS[mac_type]
+    except KeyError:
+        raise ValueError("Invalid file MAC time type request")
     if not os.path.isdir(directory):
         raise FileNotFoundError("[%s] not found." % directory)
 
-    for filename in get_paths_recursive(directory, exclude_dirs=True):
+    # Compute threshold once instead of for every file, and only stat every file once
+    threshold = get_timestamp_threshold(
+        years=years,
+        days=days,
+        hours=hours,
+        minutes=minutes,
+        seconds=seconds,
+        timestamp=timestamp,
+    )
+
+    candidates = []
+    for entry in get_paths_recursive(directory, exclude_dirs=True, yield_entries=True):
         try:
-            if check_file_timestamp_delta(
-                filename,
-                mac_type=mac_type,
-                years=years,
-                days=days,
-                hours=hours,
-                minutes=minutes,
-                seconds=seconds,
-                timestamp=timestamp,
-            ):
-                os.remove(filename)
+            if (threshold - getattr(entry.stat(), stat_attr)) > 0:
+                candidates.append(entry.path)
         except FileNotFoundError:
             pass
         except (IOError, OSError):
-            raise OSError("Cannot remove file [%s]." % filename)
+            raise OSError("Cannot remove file [%s]." % entry.path)
+    _remove_files(candidates)
 
 
 def remove_files_older_than(
@@ -678,47 +1105,109 @@ def remove_files_older_than(
     )
 
 
+def _copy_file_direct(
+    source,  # type: str
+    dest,  # type: str
+    offset=0,  # type: int
+    chunk_size=1048576,  # type: int
+):
+    # type: (...) -> None
+    """
+    Copies source file content from offset to dest, reading source with O_DIRECT so we bypass the page cache
+    O_DIRECT needs block aligned reads, so we always read aligned chunks and skip offset bytes in userspace
+    chunk_size must hence be a multiple of the filesystem block size
+
+    Raises OSError with errno.EINVAL when the filesystem does not support O_DIRECT (tmpfs, some network filesystems)
+    """
+    fd = os.open(source, os.O_RDONLY | os.O_DIRECT)
+    try:
+        # Anonymous mmaps are page aligned, which satisfies O_DIRECT buffer alignment
+        buffer = mmap.mmap(-1, chunk_size)
+        try:
+            with open(dest, "wb") as file_handle_out:
+                while True:
+                    read = os.readv(fd, [buffer])
+                    if not read:
+                        break
+                    with memoryview(buffer) as view:
+                        file_handle_out.write(view[offset:read])
+                    offset = max(offset - read, 0)
+        finally:
+            buffer.close()
+    finally:
+        os.close(fd)
+
+
 def remove_bom(
     file,  # type: str
+    direct=False,  # type: bool
 ):
     # type: (...) -> None
     """
     Remove BOM from existing UTF-8 file
     We don't use any utf-8-sig codec magic here to avoid any UnicodeDecodeErrors
     hence the function is uglier than it should, but less error prone
+
+    :param file: (str) path to file
+    :param direct: (bool) Linux only, read file with O_DIRECT to avoid polluting page cache with big files
+                   Falls back to buffered reads when filesystem doesn't support O_DIRECT
     """
 
-    buffer = 32768
+    buffer = 1048576
+    bom = b"\xef\xbb\xbf"
 
     try:
         with open(file, "rb") as file_handle_in:
-            data = file_handle_in.read(3)
-            # Throw away the data if it's a BOM
-            if data == b"\xef\xbb\xbf":
-                data = file_handle_in.read(buffer)
-            else:
+            # Files without BOM are left untouched
+            if file_handle_in.read(3) != bom:
                 return
-            with open(file + ".tmp", "wb") as file_handle_out:
-                while len(data) > 0:
-                    file_handle_out.write(data)
-                    data = file_handle_in.read(buffer)
-        if os.path.isfile(file + ".tmp"):
-            # Python 2.7 does not have os.replace()
-            try:
-                os.replace(file + ".tmp", file)
-            except AttributeError:  # Python 2 workaround
+            if direct and hasattr(os, "O_DIRECT"):
                 try:
-                    os.remove(file)
-                except:
-                    pass
-                os.rename(file + ".tmp", file)
+                    _copy_file_direct(file, file + ".tmp", len(bom), buffer)
+                except OSError as exc:
+                    if exc.errno != errno.EINVAL:
+                        raise
+                    logger.debug(
+                        "O_DIRECT not supported for {}, using buffered reads".format(
+                            file
+                        )
+                    )
+                    direct = False
+            else:
+                direct = False
+            if not direct:
+                # Throw away the BOM and stream the rest of the file in big chunks
+                with open(file + ".tmp", "wb") as file_handle_out:
+                    shutil.copyfileobj(file_handle_in, file_handle_out, buffer)
+        os.replace(file + ".tmp", file)
     except Exception as exc:
         raise OSError(exc)
 
 
+def _json_dumps(
+    data,  # type: Union[dict, list]
+    use_orjson=False,  # type: bool
+):
+    # type: (...) -> bytes
+    """
+    Serializes data to UTF-8 encoded json
+    orjson is only used on request, since its output differs from json module one: compact separators,
+    NaN / Infinity written as null, and it accepts types json module rejects, eg datetime
+    Falls back to json module when orjson isn't installed or can't handle data, eg integers bigger than 64 bits
+    """
+    if use_orjson and orjson is not None:
+        try:
+            # pylint: disable=E1101 (no-member)
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
 def write_json_to_file(
     file,  # type: str
     data,  # type: Union[dict, list]
+    use_orjson=False,  # type: bool
 ):
     # type: (...) -> None
     """
@@ -726,11 +1215,18 @@ def write_json_to_file(
 
     :param file: File to write to
     :param data: Dict to write
+    :param use_orjson: Use faster orjson encoder when installed, see _json_dumps() for output differences
     :return:
     """
 
-    with open(file, "w", encoding="utf-8") as file_handle:
-        json.dump(data, file_handle, ensure_ascii=False)
+    # Serialize before touching any file, so unserializable data leaves nothing behind
+    content = _json_dumps(data, use_orjson=use_orjson)
+    # Write to a temporary file first so we never leave a truncated file behind
+    with open(file + ".tmp", "wb") as file_handle:
+        file_handle.write(content)
+    if os.path.isfile(file):
+        shutil.copymode(file, file + ".tmp")
+    os.replace(file + ".tmp", file)
 
 
 def read_json_from_file(
@@ -744,6 +1240,7 @@ def read_json_from_file(
     """
 
     if os.path.isfile(file):
+        # We don't use orjson here since it silently turns integers bigger than 64 bits into floats
         with open(file, "r", encoding="utf-8") as file_handle:
             file_content = json.load(file_handle)
             return file_content
@@ -751,28 +1248,41 @@ def read_json_from_file(
         return {}
 
 
-def grep(
+def igrep(
     file,  # type: str
     pattern,  # type: str
     ignorecase=False,  # type bool
 ):
-    # type: (...) -> list
+    # type: (...) -> Iterable
     """
-    Grep emulation
+    Grep emulation, yields matching lines
     """
     if not os.path.isfile(file):
         raise FileNotFoundError(file)
-    result = []
 
-    with open(file, "r") as file_handle:
-        for line in file_handle:
-            if ignorecase:
-                if re.search(pattern, line, re.IGNORECASE):
-                    result.append(line)
-            else:
-                if re.search(pattern, line):
-                    result.append(line)
-    return result
+    # Compile the pattern once instead of letting re.search() look it up for every line
+    search = re.compile(pattern, re.IGNORECASE if ignorecase else 0).search
+
+    def _igrep():
+        # type: (...) -> Iterable
+        with open(file, "r") as file_handle:
+            for line in file_handle:
+                if search(line):
+                    yield line
+
+    return _igrep()
+
+
+def grep(
+    file,  # type: str
+    pattern,  # type: str
+    ignorecase=False,  # type bool
+):
+    # type: (...) -> list
+    """
+    Grep emulation
+    """
+    return list(igrep(file, pattern, ignorecase=ignorecase))
 
 
 def hide_windows_file(
@@ -781,12 +1291,31 @@ def hide_windows_file(
 ):
     # type: (...) -> bool
     """
-    Hides / unhides a file under windows by using attrib command
+    Hides / unhides a file under windows by setting its hidden attribute with Win32 API
+    Returns False on other platforms
     """
-    result, _ = command_runner('attrib %sh "%s"' % ("+" if hidden else "-", file))
-    if result == 0:
-        return True
-    return False
+    if os.name != "nt":
+        return False
+    attributes = _GetFileAttributesW(file)
+    if attributes == _INVALID_FILE_ATTRIBUTES:
+        logger.debug(
+            'Cannot get attributes of "{}": {}'.format(
+                file, ctypes.WinError(ctypes.get_last_error())
+            )
+        )
+        return False
+    if hidden:
+        attributes |= _FILE_ATTRIBUTE_HIDDEN
+    else:
+        attributes &= ~_FILE_ATTRIBUTE_HIDDEN
+    if not _SetFileAttributesW(file, attributes):
+        logger.debug(
+            'Cannot set attributes of "{}": {}'.format(
+                file, ctypes.WinError(ctypes.get_last_error())
+            )
+        )
+        return False
+    return True
 
 
 def hide_unix_file(
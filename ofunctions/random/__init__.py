@@ -18,8 +18,8 @@ __author__ = "Orsiris de Jong"
 __copyright__ = "Copyright (C) 2014-2024 Orsiris de Jong"
 __description__ = "Simple random string generator including password generator"
 __licence__ = "BSD 3 Clause"
-__version__ = "0.4.0"
-__build__ = "2024090701"
+__version__ = "0.4.1"
+__build__ = "2026101501"
 __compat__ = "python2.7+"
 
 
@@ -27,13 +27,24 @@ import string
 import random
 from ofunctions.string_handling import accent_chars, ambiguous_chars
 
+if hasattr(random, "choices"):
 
-def random_string(size=8, chars=string.ascii_letters + string.digits):
-    # type: (int, list) -> str
-    """
-    Simple password generator function
-    """
-    return "".join(random.choice(chars) for _ in range(size))
+    def random_string(size=8, chars=string.ascii_letters + string.digits):
+        # type: (int, list) -> str
+        """
+        Simple password generator function
+        """
+        # random.choices() picks all characters in one call instead of one Python level call per character
+        return "".join(random.choices(chars, k=size))
+
+else:
+    # Python < 3.6 compat where random.choices() does not exist
+    def random_string(size=8, chars=string.ascii_letters + string.digits):
+        # type: (int, list) -> str
+        """
+        Simple password generator function
+        """
+        return "".join(random.choice(chars) for _ in range(size))
 
 
 def pw_gen(size=16, chars=string.ascii_letters + string.digits):
@@ -145,7 +145,7 @@ setuptools.setup(
     keywords=["network", "bisection", "logging"],
     long_description=long_description,
     long_description_content_type="text/markdown",
-    python_requires=">=3.5",
+    python_requires=">=3.6",
     # namespace packages don't work well with zipped eggs
     # ref https://packaging.python.org/guides/packaging-namespace-packages/
     zip_safe=False,
@@ -199,7 +199,7 @@ for package in setuptools.find_namespace_packages(include=["ofunctions.*"]):
         keywords=["network", "bisection", "logging"],
         long_description=long_description,
         long_description_content_type="text/markdown",
-        python_requires=">=3.5",
+        python_requires=">=3.6",
         # namespace packages don't work well with zipped eggs
         # ref https://packaging.python.org/guides/packaging-namespace-packages/
         zip_safe=False,
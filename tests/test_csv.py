@@ -60,6 +60,45 @@ def test_csv_dict_reader():
     remove_file(file)
 
 
+def test_csv_dict_reader_fieldnames():
+    file = get_writable_random_file("csv_dict_reader")
+
+    with open(file, "wt", encoding="utf-8") as fp:
+        fp.write("# Some comment\n1,2,3\n\n4,5\n#7,8,9\n6,7,8,9\n")
+
+    data = list(
+        csv_dict_reader(file, skip_comment_char="#", fieldnames=["A", "B", "C"])
+    )
+    remove_file(file)
+
+    assert len(data) == 3, "Empty lines should be skipped"
+    assert data[0] == {"A": "1", "B": "2", "C": "3"}
+    assert data[1] == {"A": "4", "B": "5", "C": None}
+    assert data[2] == {"A": "6", "B": "7", "C": "8", None: ["9"]}
+
+
+def test_csv_dict_reader_multiline_comments():
+    """
+    Lines of quoted multiline values must not be taken for comments
+    """
+    file = get_writable_random_file("csv_dict_reader")
+
+    with open(file, "wt", encoding="utf-8", newline="") as fp:
+        fp.write(
+            '# Header comment\nname,notes\nbob,"Heading\n# title"\n"#tag",x\nalice,y\n'
+        )
+
+    data = list(csv_dict_reader(file, skip_comment_char="#"))
+    remove_file(file)
+
+    assert data == [
+        {"name": "bob", "notes": "Heading\n# title"},
+        {"name": "alice", "notes": "y"},
+    ]
+
+
 if __name__ == "__main__":
     print("Example code for %s, %s" % (__intname__, __build__))
     test_csv_dict_reader()
+    test_csv_dict_reader_fieldnames()
+    test_csv_dict_reader_multiline_comments()
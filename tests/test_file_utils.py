@@ -17,10 +17,34 @@ __copyright__ = "Copyright (C) 2020-2024 Orsiris de Jong"
 __licence__ = "BSD 3 Clause"
 __build__ = "2021052601"
 
+import inspect
+import os
 import sys
-from time import sleep
-
-from ofunctions.file_utils import *
+import tempfile
+import time
+from collections.abc import Iterator
+from datetime import datetime
+
+from ofunctions.file_utils import (
+    check_file_timestamp_delta,
+    check_path_access,
+    get_file_time,
+    get_file_times,
+    get_paths_recursive,
+    get_timestamp_threshold,
+    glob_path_match,
+    grep,
+    hide_file,
+    hide_windows_file,
+    make_path,
+    read_json_from_file,
+    remove_bom,
+    remove_dir,
+    remove_file,
+    remove_files_on_timestamp_delta,
+    replace_in_file,
+    write_json_to_file,
+)
 from ofunctions.random import random_string
 
 
@@ -41,10 +65,16 @@ def test_check_path_access():
     result = check_path_access(bin_dir, check="R")
     assert result is True, "Access to bin dir {} should be readable".format(bin_dir)
     # should be writable
-    check_path_access(tmp_dir, check="W")
+    result = check_path_access(tmp_dir, check="W")
     assert result is True, 'Access to current temp "{}" should be writable'.format(
         tmp_dir
     )
+    # Cached results can be invalidated, eg after permission changes
+    check_path_access.cache_clear()
+    result = check_path_access(bin_dir, check="R")
+    assert result is True, "Access to bin dir {} should still be readable".format(
+        bin_dir
+    )
 
 
 def test_glob_path_match():
@@ -54,6 +84,28 @@ def test_glob_path_match():
     match = glob_path_match(os.path.dirname(__file__), ["*est*"])
     assert match is True, "glob_path_match test failed"
 
+    match = glob_path_match("test_file_utils.py", ["*.txt", "test_*.py"])
+    assert match is True, "glob_path_match should match any of given patterns"
+    match = glob_path_match("test_file_utils.py", ["*.txt", "*.log"])
+    assert match is False, "glob_path_match should not match unrelated patterns"
+    match = glob_path_match("test_file_utils.py", [])
+    assert match is False, "glob_path_match should not match an empty pattern list"
+
+    # Literal patterns must match whole paths only, even when mixed with wildcards
+    patterns = ["test_file_utils.py", "*.log", "test_[ab].py"]
+    assert glob_path_match("test_file_utils.py", patterns) is True
+    assert glob_path_match("test_a.py", patterns) is True
+    assert glob_path_match("old_test_file_utils.py", patterns) is False
+    assert glob_path_match("test_file_utils.py", ["test_file_utils.py"]) is True
+    assert glob_path_match("test_file_utils.pyc", ["test_file_utils.py"]) is False
+
+    # Prefix and suffix patterns
+    assert glob_path_match("test_file_utils.py", ["*.txt", "*.py"]) is True
+    assert glob_path_match("test_file_utils.pyc", ["*.txt", "*.py"]) is False
+    assert glob_path_match("test_file_utils.py", ["test_*", "*.txt"]) is True
+    assert glob_path_match("file_utils.py", ["test_*", "*.txt"]) is False
+    assert glob_path_match("anything", ["*"]) is True
+
 
 def print_perm_error(file):
     """
@@ -66,16 +118,15 @@ def test_get_paths_recursive():
     test_directory = os.path.abspath(os.path.dirname(__file__))
     files = get_paths_recursive(test_directory, fn_on_perm_error=print_perm_error)
 
-    assert isinstance(files, chain)
+    assert isinstance(files, Iterator)
     print('BEGIN FILE LIST IN "{}"'.format(test_directory))
     for file in files:
         print(file)
     print("END FILE LIST")
 
-    files = get_paths_recursive(test_directory)
-    result_list = [os.path.basename(file) for file in files]
-    assert (
-        "test_bisection.py" in result_list
+    result_list = list(get_paths_recursive(test_directory))
+    assert any(
+        os.path.basename(file) == "test_bisection.py" for file in result_list
     ), "get_paths_recursive test failed to find test_bisection.py"
     assert (
         len(result_list) > 10
@@ -83,9 +134,9 @@ def test_get_paths_recursive():
 
     # Include directories in output
     files = get_paths_recursive(test_directory, exclude_dirs=False)
-    assert "test_json_sanitize.py" in [
-        os.path.basename(file) for file in files
-    ], "get_paths_recursive with dirs test failed"
+    assert any(
+        os.path.basename(file) == "test_json_sanitize.py" for file in files
+    ), "get_paths_recursive with dirs test failed"
 
     # Try d_exclude_list on ..\tests
     files = get_paths_recursive(
@@ -93,39 +144,39 @@ def test_get_paths_recursive():
         d_exclude_list=["tests"],
         exclude_dirs=False,
     )
-    assert "tests" + os.sep + "file_utils.py" not in [
-        os.path.basename(file) for file in files
-    ], "get_paths_recursive with d_exclude_list failed"
+    assert all(
+        file != test_directory and not file.startswith(test_directory + os.sep)
+        for file in files
+    ), "get_paths_recursive with d_exclude_list failed"
 
     # Try f_exclude_list
     files = get_paths_recursive(test_directory, f_exclude_list=["test_file_utils.py"])
-    assert "test_file_utils.py" not in [
-        os.path.basename(file) for file in files
-    ], "get_paths_recursive with f_exclude_list failed"
+    assert all(
+        os.path.basename(file) != "test_file_utils.py" for file in files
+    ), "get_paths_recursive with f_exclude_list failed"
 
     # Try ext_exclude_list
     files = get_paths_recursive(test_directory, ext_exclude_list=[".py"])
-    for file in files:
-        if file.endswith(".py"):
-            assert False, "get_paths_recursive failed with ext_exclude_list"
+    assert all(
+        not file.endswith(".py") for file in files
+    ), "get_paths_recursive failed with ext_exclude_list"
 
     # Try f_include_list
     files = get_paths_recursive(
         test_directory, f_include_list=["test_fi*utils.py"], exclude_dirs=True
     )
-    result_list = [os.path.basename(file) for file in files]
-    assert (
-        "test_file_utils.py" in result_list
+    result_list = list(files)
+    assert len(result_list) == 1 and os.path.basename(result_list[0]) == (
+        "test_file_utils.py"
     ), "get_paths_recursive with f_include_list failed"
-    assert len(result_list) == 1, "get_paths_recursive with f_include_list failed"
 
     # Try ext_include_list
     files = get_paths_recursive(
         test_directory, ext_include_list=[".py"], exclude_dirs=True
     )
-    for file in files:
-        if not file.endswith(".py"):
-            assert False, "get_paths_recursive failed with ext_include_list"
+    assert all(
+        file.endswith(".py") for file in files
+    ), "get_paths_recursive failed with ext_include_list"
 
     # Try min_depth & max_depth
     # We should see tests/file_utils.py but not ./__init__.py
@@ -136,18 +187,184 @@ def test_get_paths_recursive():
         exclude_dirs=True,
     )
     result_list = list(files)
-    # Let's first check that we don't have a <root_dir>/__init__.py file
-    if "__init__.py" in result_list:
-        assert (
-            False
-        ), "get_paths_recursive failed with min & max depth, root __init__.py file found"
+    # Let's first check that we don't have any <root_dir> file
+    parent_directory = os.path.dirname(test_directory)
+    assert all(
+        os.path.dirname(file) != parent_directory for file in result_list
+    ), "get_paths_recursive failed with min & max depth, root file found"
 
     # Now let's check for subdirectory test_file_utils file
-    basename_result_list = [os.path.basename(file) for file in result_list]
-    if not os.path.normpath("test_file_utils.py") in basename_result_list:
-        assert (
-            False
-        ), "get_paths_recursive failed with min & max depth, file_utils.py not found"
+    assert any(
+        os.path.basename(file) == "test_file_utils.py" for file in result_list
+    ), "get_paths_recursive failed with min & max depth, file_utils.py not found"
+
+
+def test_get_paths_recursive_fix_perm_error():
+    """
+    Directories must be listed again once fn_on_perm_error fixed their permissions
+    """
+    # root can read anything, and Windows doesn't honor POSIX permissions
+    if os.name == "nt" or os.geteuid() == 0:
+        return
+    test_directory = tempfile.mkdtemp(prefix="ofunctions.test_perm_error.")
+    locked_directory = os.path.join(test_directory, "locked")
+    os.mkdir(locked_directory)
+    locked_file = os.path.join(locked_directory, "f.txt")
+    with open(locked_file, "w") as file_handle:
+        file_handle.write("test")
+    os.chmod(locked_directory, 0o000)
+
+    fixed_paths = []
+
+    def fix_perm_error(path):
+        fixed_paths.append(path)
+        os.chmod(path, 0o755)
+
+    try:
+        files = list(
+            get_paths_recursive(
+                test_directory, exclude_dirs=True, fn_on_perm_error=fix_perm_error
+            )
+        )
+    finally:
+        os.chmod(locked_directory, 0o755)
+        remove_dir(test_directory)
+    assert fixed_paths == [locked_directory], "fn_on_perm_error was not called"
+    assert files == [locked_file], "get_paths_recursive did not list fixed directory"
+
+
+def test_get_paths_recursive_deep_tree():
+    """
+    Path walking must not rely on recursion, so deep trees don't raise RecursionError
+    """
+    test_directory = tempfile.mkdtemp(prefix="ofunctions.test_deep_tree.")
+    path = test_directory
+    for _ in range(80):
+        path = os.path.join(path, "d")
+        os.mkdir(path)
+    deepest_file = os.path.join(path, "file")
+    with open(deepest_file, "w") as file_handle:
+        file_handle.write("test")
+
+    recursion_limit = sys.getrecursionlimit()
+    # Allow way less stack frames than tree depth
+    sys.setrecursionlimit(len(inspect.stack()) + 40)
+    try:
+        files = list(get_paths_recursive(test_directory, exclude_dirs=True))
+    finally:
+        sys.setrecursionlimit(recursion_limit)
+    remove_dir(test_directory)
+
+    assert files == [deepest_file], "get_paths_recursive failed on deep tree"
+
+
+def test_get_paths_recursive_extensions():
+    """
+    Extensions are compared like os.path.splitext() does
+    """
+    test_directory = tempfile.mkdtemp(prefix="ofunctions.test_extensions.")
+    for filename in ["file.py", ".py", "archive.tar.gz", "noext", "file.pyc"]:
+        with open(os.path.join(test_directory, filename), "w") as file_handle:
+            file_handle.write("test")
+
+    def found(**kwargs):
+        return sorted(
+            os.path.basename(file)
+            for file in get_paths_recursive(test_directory, exclude_dirs=True, **kwargs)
+        )
+
+    assert found(ext_include_list=[".py"]) == ["file.py"]
+    assert found(ext_include_list=[".gz", ".tar.gz"]) == ["archive.tar.gz"]
+    assert found(ext_include_list=[""]) == [".py", "noext"]
+    assert found(ext_exclude_list=[".py", ".tar.gz"]) == [
+        ".py",
+        "archive.tar.gz",
+        "file.pyc",
+        "noext",
+    ]
+    # Single extensions may be given as strings
+    assert found(ext_include_list=".py") == ["file.py"]
+    assert found(ext_exclude_list=".py") == [
+        ".py",
+        "archive.tar.gz",
+        "file.pyc",
+        "noext",
+    ]
+    remove_dir(test_directory)
+
+
+def test_get_paths_recursive_symlinks():
+    test_directory = tempfile.mkdtemp(prefix="ofunctions.test_symlinks.")
+    sub_directory = os.path.join(test_directory, "a")
+    os.mkdir(sub_directory)
+    with open(os.path.join(sub_directory, "file"), "w") as file_handle:
+        file_handle.write("test")
+    try:
+        # Loop back to walk root, and a second way to reach sub_directory
+        os.symlink(test_directory, os.path.join(sub_directory, "loop"))
+        os.symlink(sub_directory, os.path.join(test_directory, "link"))
+    except (NotImplementedError, OSError):
+        # Windows needs privileges to create symlinks
+        remove_dir(test_directory)
+        return
+
+    for workers in [1, 4]:
+        files = sorted(
+            get_paths_recursive(test_directory, exclude_dirs=True, workers=workers)
+        )
+        assert files == [
+            os.path.join(sub_directory, "file"),
+            os.path.join(test_directory, "link", "file"),
+        ], "get_paths_recursive should walk symlinked directories only once"
+
+        files = list(
+            get_paths_recursive(
+                test_directory,
+                exclude_dirs=True,
+                follow_symlinks=False,
+                workers=workers,
+            )
+        )
+        assert files == [
+            os.path.join(sub_directory, "file")
+        ], "get_paths_recursive should not follow symlinks"
+    remove_dir(test_directory)
+
+
+def test_get_paths_recursive_workers():
+    test_directory = os.path.join(os.path.abspath(os.path.dirname(__file__)), os.pardir)
+    for kwargs in [
+        {"exclude_dirs": False},
+        {"exclude_files": True, "min_depth": 2},
+        {"d_exclude_list": ["tests"], "ext_include_list": [".py"], "max_depth": 3},
+    ]:
+        serial_files = list(get_paths_recursive(test_directory, **kwargs))
+        parallel_files = list(get_paths_recursive(test_directory, workers=4, **kwargs))
+        assert sorted(serial_files) == sorted(
+            parallel_files
+        ), "get_paths_recursive with workers failed with {}".format(kwargs)
+
+    # Stopping iteration early must not hang
+    files = get_paths_recursive(test_directory, workers=4)
+    assert next(files), "get_paths_recursive with workers returned nothing"
+    files.close()
+
+
+def test_remove_file():
+    test_directory = tempfile.mkdtemp(prefix="ofunctions.test_remove_file.")
+    path = os.path.join(test_directory, "file")
+    with open(path, "w") as file_handle:
+        file_handle.write("test")
+    # Read-only files must also be removed
+    os.chmod(path, 0o444)
+    remove_file(path)
+    assert not os.path.exists(path), "remove_file failed"
+
+    # Missing files and directories are ignored
+    remove_file(path)
+    remove_file(test_directory)
+    assert os.path.isdir(test_directory), "remove_file should not remove directories"
+    remove_dir(test_directory)
 
 
 def test_remove_bom():
@@ -168,6 +385,125 @@ def test_remove_bom():
 
     assert file_data == utf8_without_bom_data, "Test file does not look like it should"
 
+    # Files without BOM should be left untouched
+    with open(filename, "wb") as fp:
+        fp.write(utf8_without_bom_data)
+
+    remove_bom(filename)
+
+    with open(filename, "rb") as fp:
+        file_data = fp.read()
+    remove_file(filename)
+
+    assert file_data == utf8_without_bom_data, "File without BOM should not change"
+
+    # O_DIRECT reads, which fall back to buffered reads when unsupported
+    with open(filename, "wb") as fp:
+        fp.write(utf8_with_bom_data)
+
+    remove_bom(filename, direct=True)
+
+    with open(filename, "rb") as fp:
+        file_data = fp.read()
+    remove_file(filename)
+
+    assert file_data == utf8_without_bom_data, "Direct read BOM removal failed"
+
+
+def test_replace_in_file():
+    filename = "ofunctions.test_replace_in_file." + random_string(16) + ".file"
+    remove_file(filename)
+
+    with open(filename, "w") as fp:
+        fp.write("Some text with some words\n" * 1000)
+
+    replace_in_file(filename, "some", "another", backup_ext=".bak")
+
+    with open(filename, "r") as fp:
+        file_data = fp.read()
+    with open(filename + ".bak", "r") as fp:
+        backup_data = fp.read()
+    remove_file(filename)
+    remove_file(filename + ".bak")
+
+    assert (
+        file_data == "Some text with another words\n" * 1000
+    ), "Text has not been replaced"
+    assert (
+        backup_data == "Some text with some words\n" * 1000
+    ), "Backup file does not look like original file"
+
+    # Replace into another file, source file must stay untouched
+    dest_filename = filename + ".dest"
+    with open(filename, "w") as fp:
+        fp.write("Some text with some words\n")
+
+    replace_in_file(filename, "some", "another", dest_file=dest_filename)
+
+    with open(filename, "r") as fp:
+        file_data = fp.read()
+    with open(dest_filename, "r") as fp:
+        dest_data = fp.read()
+    remove_file(filename)
+    remove_file(dest_filename)
+
+    assert file_data == "Some text with some words\n", "Source file has been modified"
+    assert dest_data == "Some text with another words\n", "Text has not been replaced"
+
+
+def test_write_read_json():
+    filename = "ofunctions.test_json." + random_string(16) + ".json"
+    remove_file(filename)
+
+    data = {"name": "éàü", "values": [1, 2.5, None, True], "nested": {"key": 1}}
+    write_json_to_file(filename, data)
+    assert not os.path.isfile(filename + ".tmp"), "Temporary file should be gone"
+    result = read_json_from_file(filename)
+    remove_file(filename)
+
+    assert result == data, "Read json does not match written data"
+    assert read_json_from_file(filename) == {}, "Missing file should return {}"
+
+    # Output must not depend on optional orjson being installed
+    write_json_to_file(filename, {"value": float("nan")})
+    result = read_json_from_file(filename)
+    assert result["value"] != result["value"], "NaN should be written as NaN"
+    try:
+        write_json_to_file(filename, {"date": datetime.now()})
+        assert False, "datetime should not be serializable"
+    except TypeError:
+        pass
+    assert not os.path.isfile(filename + ".tmp"), "Temporary file should be gone"
+    write_json_to_file(filename, data, use_orjson=True)
+    assert read_json_from_file(filename) == data, "orjson written data does not match"
+
+    # Existing file permissions are kept
+    if os.name != "nt":
+        os.chmod(filename, 0o600)
+        write_json_to_file(filename, data)
+        assert (
+            os.stat(filename).st_mode & 0o777 == 0o600
+        ), "write_json_to_file changed file permissions"
+    remove_file(filename)
+
+
+def test_grep():
+    filename = "ofunctions.test_grep." + random_string(16) + ".file"
+    remove_file(filename)
+
+    with open(filename, "w") as fp:
+        fp.write("First line\nSecond LINE\nthird one\n")
+
+    result = grep(filename, r"line")
+    ignorecase_result = grep(filename, r"^.*line$", ignorecase=True)
+    remove_file(filename)
+
+    assert result == ["First line\n"], "grep should only return matching lines"
+    assert ignorecase_result == [
+        "First line\n",
+        "Second LINE\n",
+    ], "grep with ignorecase failed"
+
 
 def test_get_file_time():
     for mac_type in ["ctime", "mtime", "atime"]:
@@ -179,32 +515,48 @@ def test_get_file_time():
         ), "Timestamp could not be converted to datetime object"
         assert 2021 <= dt.year < 2300, "Code will probably not run in 200 years, ehh"
 
+    # All MAC times at once must match single MAC time requests
+    stat_result = os.stat(__file__)
+    mac_times = get_file_times(__file__)
+    assert sorted(mac_times) == ["atime", "ctime", "mtime"], "get_file_times failed"
+    for mac_type, mac_timestamp in mac_times.items():
+        assert mac_timestamp == get_file_time(
+            __file__, mac_type, stat_result=stat_result
+        ), "get_file_times and get_file_time differ"
+
 
 def test_check_file_timestamp_delta():
     """
     Windows file creation dates are VERY wrong when requested by python
     The following code will keep earlier file creation dates, even if file is removed
-    Hence we'll add some random string to the filename to make sure the tests will not fail
+    Hence we use a fresh unique temporary file to make sure the tests will not fail
     """
-    filename = (
-        "ofunctions.test_check_file_timestamp_delta." + random_string(16) + ".file"
-    )
     test_directory = os.path.abspath(os.path.dirname(__file__))
-    path = os.path.join(test_directory, filename)
-    remove_file(path)
-
-    with open(path, "w") as file_handle:
-        file_handle.write("test")
-    result = check_file_timestamp_delta(
-        path, years=0, days=0, hours=0, minutes=0, seconds=-2
+    fd, path = tempfile.mkstemp(
+        prefix="ofunctions.test_check_file_timestamp_delta.", suffix=".file"
     )
-    assert result is False, "Just created file should not be older than 2 seconds"
-    sleep(3)
-    result = check_file_timestamp_delta(
-        path, years=0, days=0, hours=0, minutes=0, seconds=-2
-    )
-    assert result is True, "Just created file should now be older than 2 seconds"
-    remove_file(path)
+    try:
+        os.write(fd, b"test")
+        os.close(fd)
+        result = check_file_timestamp_delta(
+            path, years=0, days=0, hours=0, minutes=0, seconds=-2
+        )
+        assert result is False, "Just created file should not be older than 2 seconds"
+        # Compare from 3 seconds in the future instead of sleeping
+        result = check_file_timestamp_delta(
+            path,
+            years=0,
+            days=0,
+            hours=0,
+            minutes=0,
+            seconds=-2,
+            timestamp=time.time() + 3,
+        )
+        assert (
+            result is True
+        ), "Just created file should be older than 2 seconds in 3 seconds"
+    finally:
+        os.remove(path)
 
     result = check_file_timestamp_delta(
         sys.argv[0], years=-200, days=0, hours=0, minutes=0, seconds=0
@@ -213,6 +565,89 @@ def test_check_file_timestamp_delta():
         result is False
     ), "Ahh see... A file older than 200 years ? Is my code still running in the year 2221 ?"
 
+    # DirEntry objects and precomputed stat results must give the same results as paths
+    test_file = os.path.abspath(__file__)
+    stat_result = os.stat(test_file)
+    entries = list(
+        get_paths_recursive(
+            test_directory,
+            f_include_list=[os.path.basename(test_file)],
+            exclude_dirs=True,
+            yield_entries=True,
+        )
+    )
+    assert len(entries) == 1, "yield_entries should yield test file only"
+    entry = entries[0]
+    assert isinstance(entry, os.DirEntry), "yield_entries should yield DirEntry"
+    assert entry.path == test_file, "yield_entries yielded wrong DirEntry"
+    for days in [-1, 1]:
+        expected = check_file_timestamp_delta(test_file, mac_type="mtime", days=days)
+        assert (
+            check_file_timestamp_delta(entry, mac_type="mtime", days=days) is expected
+        ), "check_file_timestamp_delta failed with DirEntry"
+        assert (
+            check_file_timestamp_delta(
+                test_file, mac_type="mtime", days=days, stat_result=stat_result
+            )
+            is expected
+        ), "check_file_timestamp_delta failed with stat_result"
+
+    # A precomputed threshold is used as is when no delta is given
+    threshold = get_timestamp_threshold(days=1)
+    assert check_file_timestamp_delta(
+        test_file, mac_type="mtime", timestamp=threshold
+    ), "check_file_timestamp_delta failed with precomputed threshold"
+
+    # Thresholds must not depend on local timezone
+    if hasattr(time, "tzset"):
+        original_tz = os.environ.get("TZ")
+        os.environ["TZ"] = "Etc/GMT-5"
+        time.tzset()
+        try:
+            threshold = get_timestamp_threshold(seconds=-3600)
+        finally:
+            if original_tz is None:
+                del os.environ["TZ"]
+            else:
+                os.environ["TZ"] = original_tz
+            time.tzset()
+        assert (
+            abs(threshold - (time.time() - 3600)) < 60
+        ), "get_timestamp_threshold depends on timezone"
+
+    try:
+        check_file_timestamp_delta(test_directory)
+        assert False, "check_file_timestamp_delta should not accept directories"
+    except FileNotFoundError:
+        pass
+
+
+def test_remove_files_on_timestamp_delta():
+    test_directory = tempfile.mkdtemp(prefix="ofunctions.test_remove_files.")
+    sub_directory = os.path.join(test_directory, "subdir")
+    make_path(sub_directory)
+    # Enough files to also use parallel removal
+    paths = [os.path.join(test_directory, "file")] + [
+        os.path.join(sub_directory, "file{}".format(index)) for index in range(100)
+    ]
+    for path in paths:
+        with open(path, "w") as file_handle:
+            file_handle.write("test")
+
+    # Nothing should be older than one day
+    remove_files_on_timestamp_delta(test_directory, mac_type="mtime", days=-1)
+    assert all(
+        os.path.isfile(path) for path in paths
+    ), "Recent files should not have been removed"
+
+    # Everything should be older than one day in the future
+    remove_files_on_timestamp_delta(test_directory, mac_type="mtime", days=1)
+    assert not any(
+        os.path.isfile(path) for path in paths
+    ), "Files should have been removed"
+    assert os.path.isdir(sub_directory), "Directories should not be removed"
+    remove_dir(test_directory)
+
 
 def test_hide_file():
     """
@@ -229,6 +664,10 @@ def test_hide_file():
 
     assert hide_file(path), "File is now hidden"
     assert hide_file(path, False), "File is now visible"
+    if os.name != "nt":
+        assert (
+            hide_windows_file(path) is False
+        ), "hide_windows_file should do nothing on other platforms"
 
     remove_file(path)
 
@@ -238,7 +677,17 @@ if __name__ == "__main__":
     test_check_path_access()
     test_glob_path_match()
     test_get_paths_recursive()
+    test_get_paths_recursive_fix_perm_error()
+    test_get_paths_recursive_deep_tree()
+    test_get_paths_recursive_extensions()
+    test_get_paths_recursive_symlinks()
+    test_get_paths_recursive_workers()
+    test_remove_file()
     test_remove_bom()
+    test_replace_in_file()
+    test_write_read_json()
+    test_grep()
     test_get_file_time()
     test_check_file_timestamp_delta()
+    test_remove_files_on_timestamp_delta()
     test_hide_file()
@@ -21,6 +21,17 @@ from ofunctions.string_handling import accent_chars, ambiguous_chars
 from ofunctions.random import *
 
 
+def test_random_string():
+    result = random_string()
+    assert len(result) == 8, "Random string should be 8 char long by default"
+    for char in result:
+        assert (
+            char in string.ascii_letters or char in string.digits
+        ), "Random string is not compliant"
+    assert random_string(0) == "", "Empty random string should be empty"
+    assert set(random_string(100, "ab")) <= {"a", "b"}, "Random string has wrong chars"
+
+
 def test_pw_gen():
     password = pw_gen(20)
     print("Generated password: %s" % password)
@@ -50,5 +61,6 @@ def test_password_gen():
 
 if __name__ == "__main__":
     print("Example code for %s, %s" % (__intname__, __build__))
+    test_random_string()
     test_pw_gen()
     test_password_gen()